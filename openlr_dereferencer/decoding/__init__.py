@@ -31,6 +31,25 @@ LR = TypeVar("LocationReference",
 MapObjects = TypeVar("MapObjects", LineLocation, Coordinates, PointAlongLine)
 
 
+def decode_geocoordinate(
+        reference: GeoCoordinateLocationReference,
+        reader: MapReader,
+        config: Config,
+        observer: Optional[DecoderObserver]
+) -> Coordinates:
+    "Decodes a geo coordinate location reference, which needs no map at all"
+    return reference.point
+
+
+#: The decoding function for every supported location reference type
+_DECODERS = {
+    LineLocationReference: decode_line,
+    PointAlongLineLocationReference: decode_pointalongline,
+    GeoCoordinateLocationReference: decode_geocoordinate,
+    PoiWithAccessPointLocationReference: decode_poi_with_accesspoint,
+}
+
+
 def decode(
         reference: LR,
         reader: MapReader,
@@ -68,20 +87,17 @@ def decode(
         LRDecodeError:
             Raised if the decoding process was not successful.
     """
-    if isinstance(reference, LineLocationReference):
-        return decode_line(reference, reader, config, observer)
-    elif isinstance(reference, PointAlongLineLocationReference):
-        return decode_pointalongline(reference, reader, config, observer)
-    elif isinstance(reference, GeoCoordinateLocationReference):
-        return reference.point
-    elif isinstance(reference, PoiWithAccessPointLocationReference):
-        return decode_poi_with_accesspoint(reference, reader, config, observer)
-    else:
-        raise LRDecodeError(
-            "Currently, the following reference types are supported:\n"
-            " · GeoCoordinateLocation\n"
-            " · LineLocation\n"
-            " · PointAlongLineLocation\n"
-            " · PoiWithAccessPointLocation\n"
-            f'The value "{reference}" is none of them.'
-        )
+    # Walking the MRO keeps subclasses of the reference types working,
+    # while the exact types are found with the first lookup.
+    for reference_type in type(reference).__mro__:
+        decoder = _DECODERS.get(reference_type)
+        if decoder is not None:
+            return decoder(reference, reader, config, observer)
+    raise LRDecodeError(
+        "Currently, the following reference types are supported:\n"
+        " · GeoCoordinateLocation\n"
+        " · LineLocation\n"
+        " · PointAlongLineLocation\n"
+        " · PoiWithAccessPointLocation\n"
+        f'The value "{reference}" is none of them.'
+    )
@@ -1,72 +1,100 @@
 "Contains functions for candidate searching and map matching"
 
-from itertools import product
+from heapq import heappush, heappop, nlargest
+from itertools import islice, product
+from operator import attrgetter
 from logging import debug
-from typing import Optional, Iterable, List, Tuple
-from openlr import FRC, LocationReferencePoint
-from ..maps import shortest_path, MapReader, Line, Node
+from typing import Optional, Iterable, Iterator, List, Sequence, Tuple, Dict, Hashable, Callable
+from openlr import Coordinates, FRC, LocationReferencePoint
+from ..maps import shortest_path_with_length, MapReader, Line, Node
 from ..maps.a_star import LRPathNotFoundError
+from ..maps.wgs84 import split_line
 from ..observer import DecoderObserver
 from .candidate import Candidate
 from .scoring import score_lrp_candidate, angle_difference
 from .error import LRDecodeError
-from .path_math import coords, project, compute_bearing
+from .path_math import coords, project_onto_geometry, compute_bearing, split_point
 from .routes import Route
 from .configuration import Config
 
 
+#: Sort key for candidates
+by_score = attrgetter("score")
+
+#: Remembers for node ids whether the node is valid, during one decoding
+NodeCache = Dict[Hashable, bool]
+
+
 def make_candidate(
-    lrp: LocationReferencePoint, line: Line, config: Config, observer: Optional[DecoderObserver], is_last_lrp: bool
+    lrp: LocationReferencePoint, line: Line, config: Config, observer: Optional[DecoderObserver], is_last_lrp: bool,
+    node_cache: Optional[NodeCache] = None, lrp_coords: Optional[Coordinates] = None
 ) -> Candidate:
-    "Returns one or none LRP candidates based on the given line"
+    """Returns one or none LRP candidates based on the given line
+
+    The optional `node_cache` remembers which nodes are valid for snapping, see `is_valid_node`.
+    If the coordinates of the LRP are already at hand, they can be passed as `lrp_coords`."""
     # When the line is of length zero, we expect that also the adjacent lines are considered as candidates, hence
     # we don't need to project on the point that is the degenerated line.
-    if line.geometry.length == 0:
+    geometry = line.geometry
+    if geometry.length == 0:
         return
-    point_on_line = project(line, coords(lrp))
+    point_on_line, geometry_length = project_onto_geometry(
+        line, geometry, coords(lrp) if lrp_coords is None else lrp_coords
+    )
     reloff = point_on_line.relative_offset
+    # The distances from the projection point to both ends of the line, which need the line length only once
+    line_length = line.length
+    distance_from_start = reloff * line_length
+    distance_to_end = (1.0 - reloff) * line_length
     # In case the LRP is not the last LRP
     if not is_last_lrp:
         # Snap to the relevant end of the line, only if the node is not a simple connection node between two lines:
         # so it does not look like this: ----*-----
-        if abs(point_on_line.distance_from_start()) <= config.candidate_threshold and is_valid_node(line.start_node):
+        if distance_from_start <= config.candidate_threshold and is_valid_node(line.start_node, node_cache):
             reloff = 0.0
         # If the projection onto the line is close to the END of the line,
         # discard the point since we expect that the start of
         # an adjacent line will be considered as candidate and that would be the better candidate.
         else:
-            if abs(point_on_line.distance_to_end()) <= config.candidate_threshold and is_valid_node(line.end_node):
+            if distance_to_end <= config.candidate_threshold and is_valid_node(line.end_node, node_cache):
                 return
     # In case the LRP is the last LRP
     if is_last_lrp:
         # Snap to the relevant end of the line, only if the node is not a simple connection node between two lines:
         # so it does not look like this: ----*-----
-        if abs(point_on_line.distance_to_end()) <= config.candidate_threshold and is_valid_node(line.end_node):
+        if distance_to_end <= config.candidate_threshold and is_valid_node(line.end_node, node_cache):
             reloff = 1.0
         else:
             # If the projection onto the line is close to the START of the line,
             # discard the point since we expect that the end of an adjacent line
             # will be considered as candidate and that would be the better candidate.
-            if point_on_line.distance_from_start() <= config.candidate_threshold and is_valid_node(line.start_node):
+            if distance_from_start <= config.candidate_threshold and is_valid_node(line.start_node, node_cache):
                 return
     # Drop candidate if there is no partial line left
     if is_last_lrp and reloff <= 0.0 or not is_last_lrp and reloff >= 1.0:
         return
     candidate = Candidate(line, reloff)
-    bearing = compute_bearing(lrp, candidate, is_last_lrp, config.bear_dist)
-    bear_diff = angle_difference(bearing, lrp.bear)
-    if abs(bear_diff) > config.max_bear_deviation:
-        if observer is not None:
-            observer.on_candidate_rejected(
-                lrp, candidate,
-                f"Bearing difference = {bear_diff} greater than max. bearing deviation = {config.max_bear_deviation}",
+    # Splitting the line at the candidate yields the partial line for the bearing and also the
+    # position of the candidate. Like `candidate.split()`, but reusing the geometry and its
+    # length from the projection.
+    parts = split_line(geometry, geometry_length * reloff)
+    # The bearing is only needed if a deviation can reject the candidate or it counts for the score
+    bearing = None
+    if config.max_bear_deviation < 180.0 or config.bear_weight != 0.0:
+        bearing = compute_bearing(lrp, candidate, is_last_lrp, config.bear_dist, parts)
+        bear_diff = angle_difference(bearing, lrp.bear)
+        if abs(bear_diff) > config.max_bear_deviation:
+            if observer is not None:
+                observer.on_candidate_rejected(
+                    lrp, candidate,
+                    f"Bearing difference = {bear_diff} greater than max. bearing deviation = {config.max_bear_deviation}",
+                )
+            debug(
+                "Not considering %s because the bearing difference is %.02f°. (bear: %.02f. lrp bear: %.02f)", 
+                candidate, bear_diff, bearing, lrp.bear
             )
-        debug(
-            "Not considering %s because the bearing difference is %.02f°. (bear: %.02f. lrp bear: %.02f)", 
-            candidate, bear_diff, bearing, lrp.bear
-        )
-        return
-    candidate.score = score_lrp_candidate(lrp, candidate, config, is_last_lrp)
+            return
+    candidate.score = score_lrp_candidate(lrp, candidate, config, is_last_lrp, bearing, split_point(parts))
     if candidate.score < config.min_score:
         if observer is not None:
             observer.on_candidate_rejected(
@@ -74,8 +102,8 @@ def make_candidate(
                 f"Candidate score = {candidate.score} lower than min. score = {config.min_score}",
             )
         debug(
-            f"Not considering {candidate}",
-            f"Candidate score = {candidate.score} < min. score = {config.min_score}",
+            "Not considering %s because candidate score = %.02f < min. score = %.02f",
+            candidate, candidate.score, config.min_score
         )
         return
     if observer is not None:
@@ -87,24 +115,130 @@ def make_candidate(
 
 def nominate_candidates(
     lrp: LocationReferencePoint, reader: MapReader, config: Config,
-    observer: Optional[DecoderObserver], is_last_lrp: bool
+    observer: Optional[DecoderObserver], is_last_lrp: bool, lines: Optional[Iterable[Line]] = None,
+    node_cache: Optional[NodeCache] = None
 ) -> Iterable[Candidate]:
-    "Yields candidate lines for the LRP along with their score."
-    debug(
-        "Finding candidates for LRP %s at %s within radius %.02f m", lrp, coords(lrp), config.search_radius
+    """Yields candidate lines for the LRP along with their score.
+
+    If the lines within the search radius around the LRP are already known, they can be given
+    as `lines`. Otherwise, the map reader is queried for them. The optional `node_cache` is
+    passed on to `make_candidate`.
+
+    If `config.max_candidates` is set, only that many best-scored candidates are yielded."""
+    lrp_coords = coords(lrp)
+    if lines is None:
+        debug(
+            "Finding candidates for LRP %s at %s within radius %.02f m", lrp, lrp_coords, config.search_radius
+        )
+        lines = reader.find_lines_close_to(lrp_coords, config.search_radius)
+    candidates = (
+        make_candidate(lrp, line, config, observer, is_last_lrp, node_cache, lrp_coords) for line in lines
     )
-    for line in reader.find_lines_close_to(coords(lrp), config.search_radius):
-        candidate = make_candidate(lrp, line, config, observer, is_last_lrp)
-        if candidate:
-            yield candidate
+    candidates = (candidate for candidate in candidates if candidate)
+    if config.max_candidates is not None:
+        candidates = nlargest(config.max_candidates, candidates, key=by_score)
+    yield from candidates
+
+
+#: Remembers the nominated candidates of an LRP (and whether it is the last LRP) during one decoding
+CandidateCache = Dict[Tuple[LocationReferencePoint, bool], List[Candidate]]
+
+
+def cached_candidates(
+    lrp: LocationReferencePoint, reader: MapReader, config: Config,
+    observer: Optional[DecoderObserver], is_last_lrp: bool, cache: CandidateCache
+) -> List[Candidate]:
+    """Returns the candidates for the LRP, nominating them only if they are not in `cache` yet.
+
+    When backtracking, the same LRP is visited again. The cache avoids repeating
+    the map queries and scoring for it."""
+    key = (lrp, is_last_lrp)
+    candidates = cache.get(key)
+    if candidates is None:
+        candidates = list(nominate_candidates(lrp, reader, config, observer, is_last_lrp))
+        cache[key] = candidates
+    return candidates
+
+
+def frc_filter(lfrc: FRC) -> Callable[[Line], bool]:
+    "Returns a line filter which only lets lines with an FRC of `lfrc` or more important pass"
+    def linefilter(line: Line) -> bool:
+        return line.frc <= lfrc
+    return linefilter
+
+
+#: The line filter for every lowest FRC, which is created once instead of for every path search
+LINEFILTERS = {frc: frc_filter(frc) for frc in FRC}
+
+
+#: Remembers the shortest paths between two nodes for a lowest FRC during one decoding.
+#: A value is the path and its length, or None and the length up to which no path was found.
+PathCache = Dict[Tuple[Hashable, Hashable, FRC], Tuple[Optional[List[Line]], float]]
+
+
+def cached_shortest_path(
+    start: Node, dest: Node, lfrc: FRC, maxlen: float, cache: PathCache
+) -> Optional[Tuple[List[Line], float]]:
+    """Returns the shortest path between two nodes and its length, reusing earlier searches from `cache`.
+
+    Different candidate pairs often share the nodes their lines end and start at, and backtracking
+    repeats candidate pairs. As the shortest path does not depend on `maxlen`, a search result
+    answers every later query, unless only a shorter `maxlen` was searched without success.
+
+    Returns None if there is no path of at most `maxlen` meters."""
+    key = (start.node_id, dest.node_id, lfrc)
+    cached = cache.get(key)
+    if cached is not None:
+        path, length = cached
+        if path is not None:
+            return cached if length <= maxlen else None
+        if maxlen <= length:
+            return None
+    try:
+        found = shortest_path_with_length(start, dest, LINEFILTERS[lfrc], maxlen=maxlen)
+    except LRPathNotFoundError:
+        cache[key] = (None, maxlen)
+        return None
+    cache[key] = found
+    return found
+
+
+def find_candidate_route(
+    start: Candidate, dest: Candidate, lfrc: FRC, maxlen: float, path_cache: Optional[PathCache] = None
+) -> Optional[Tuple[Route, float]]:
+    """Returns the route between two LRP candidates like `get_candidate_route`, along with its length.
+
+    The length is assembled from the lengths already known while searching, so that the
+    lines of the route do not need to be measured again."""
+    debug("Try to find path between %s,%s", start, dest)
+    if start.line.line_id == dest.line.line_id:
+        return Route(start, [], dest), (dest.relative_offset - start.relative_offset) * start.line.length
+    # Besides the path, the route covers the rest of the start line and the beginning of the
+    # destination line. Only what is left of `maxlen` may be spent on the path in between.
+    partial_length = start.distance_to_end() + dest.distance_from_start()
+    if partial_length > maxlen:
+        debug("The partial lines alone are longer than %.02fm", maxlen)
+        return None
+    start_node = start.line.end_node
+    dest_node = dest.line.start_node
+    debug("Finding path between nodes %s,%s", start_node.node_id, dest_node.node_id)
+    found = cached_shortest_path(
+        start_node, dest_node, lfrc, maxlen - partial_length, {} if path_cache is None else path_cache
+    )
+    if found is None:
+        debug("No path found between these nodes")
+        return None
+    path, length = found
+    debug("Returning %s", path)
+    return Route(start, path, dest), partial_length + length
 
 
 def get_candidate_route(
-    start: Candidate, dest: Candidate, lfrc: FRC, maxlen: float
+    start: Candidate, dest: Candidate, lfrc: FRC, maxlen: float, path_cache: Optional[PathCache] = None
 ) -> Optional[Route]:
     """Returns the shortest path between two LRP candidates, excluding partial lines.
 
-    If it is longer than `maxlen`, it is treated as if no path exists.
+    If the route is longer than `maxlen`, it is treated as if no path exists.
 
     Args:
         map_reader:
@@ -116,29 +250,96 @@ def get_candidate_route(
         lfrc:
             "lowest frc". Line objects from map_reader with an FRC lower than lfrc will be ignored.
         maxlen:
-            Pathfinding will be canceled after exceeding a length of maxlen.
+            Pathfinding will be canceled after the route exceeds a length of maxlen.
+        path_cache:
+            If given, shortest paths are looked up in and added to this cache.
 
     Returns:
         If a matching shortest path is found, it is returned as a list of Line objects.
         The returned path excludes the lines the candidate points are on.
         If there is no matching path found, None is returned.
     """
-    debug("Try to find path between %s,%s",start, dest)
-    if start.line.line_id == dest.line.line_id:
-        return Route(start, [], dest)
-    debug(
-        "Finding path between nodes %d,%d",start.line.end_node.node_id, dest.line.start_node.node_id
-    )
-    linefilter = lambda line: line.frc <= lfrc
-    try:
-        path = shortest_path(
-            start.line.end_node, dest.line.start_node, linefilter, maxlen=maxlen
-        )
-        debug("Returning %s", path)
-        return Route(start, path, dest)
-    except LRPathNotFoundError:
-        debug("No path found between these nodes")
-        return None
+    found = find_candidate_route(start, dest, lfrc, maxlen, path_cache)
+    return None if found is None else found[0]
+
+
+#: Up to this number of candidate pairs, `ordered_pairs` sorts them all at once
+SMALL_PAIR_COUNT = 8
+
+
+def pair_score(pair: Tuple[Candidate, Candidate]) -> float:
+    "Returns the score sum of a candidate pair"
+    return pair[0].score + pair[1].score
+
+
+def ordered_pairs(
+    candidates: Sequence[Candidate], next_candidates: Sequence[Candidate]
+) -> Iterator[Tuple[Candidate, Candidate]]:
+    """Yields every pair of a candidate and a next candidate, highest score sum first.
+
+    Instead of sorting the whole cartesian product up front, the pairs are generated
+    lazily from a heap. Usually, one of the first pairs already matches, so most of
+    the pairs never need to be ordered."""
+    first = sorted(candidates, key=by_score, reverse=True)
+    second = sorted(next_candidates, key=by_score, reverse=True)
+    if not first or not second:
+        return
+    if len(first) * len(second) <= SMALL_PAIR_COUNT:
+        # Sorting a few pairs at once is cheaper than maintaining the heap. As the sort
+        # is stable, equal score sums come in the same order as from the heap.
+        yield from sorted(product(first, second), key=pair_score, reverse=True)
+        return
+    # The heap only works on the scores, so read them from the candidates once
+    first_scores = [candidate.score for candidate in first]
+    second_scores = [candidate.score for candidate in second]
+    first_count, second_count = len(first), len(second)
+    # Every pair (i, j) is pushed exactly once: from (i, j - 1), or from (i - 1, 0) if j is 0.
+    # The score sum of a pushed pair is never higher than the one of the popped pair.
+    heap = [(-(first_scores[0] + second_scores[0]), 0, 0)]
+    while heap:
+        _, i, j = heappop(heap)
+        yield first[i], second[j]
+        if j + 1 < second_count:
+            heappush(heap, (-(first_scores[i] + second_scores[j + 1]), i, j + 1))
+        if j == 0 and i + 1 < first_count:
+            heappush(heap, (-(first_scores[i + 1] + second_scores[0]), i + 1, 0))
+
+
+def matching_routes(
+    current: LocationReferencePoint,
+    candidates: List[Candidate],
+    next_lrp: LocationReferencePoint,
+    is_last_lrp: bool,
+    reader: MapReader,
+    config: Config,
+    observer: Optional[DecoderObserver],
+    candidate_cache: CandidateCache,
+    path_cache: PathCache,
+) -> Iterator[Tuple[Route, Candidate]]:
+    """Yields the routes from `candidates` to candidates of `next_lrp` which match the DNP.
+
+    Every route is yielded together with the candidate of `next_lrp` it ends at. The candidate
+    pairs are tried best scores first, and the next route is only searched when asked for it.
+    Once no candidate pair is left, the observer is notified."""
+    # The accepted distance to next point. This helps to save computations and filter bad paths
+    minlen = (1 - config.max_dnp_deviation) * current.dnp - config.tolerated_dnp_dev
+    maxlen = (1 + config.max_dnp_deviation) * current.dnp + config.tolerated_dnp_dev
+    lfrc = config.tolerated_lfrc[current.lfrcnp]
+
+    next_candidates = cached_candidates(next_lrp, reader, config, observer, is_last_lrp, candidate_cache)
+    lrp_pair = (current, next_lrp)
+
+    # For every pair of candidates, best scores first, search for a path matching our requirements
+    for candidate_pair in ordered_pairs(candidates, next_candidates):
+        if candidate_pair[0].score + candidate_pair[1].score < config.min_pair_score:
+            debug("The remaining candidate pairs score less than %.02f", config.min_pair_score)
+            break
+        route = handleCandidatePair(lrp_pair, candidate_pair, observer, lfrc, minlen, maxlen, path_cache)
+        if route is not None:
+            yield route, candidate_pair[1]
+
+    if observer is not None:
+        observer.on_matching_fail(current, next_lrp, candidates, next_candidates, "No candidate pair matches")
 
 
 def match_tail(
@@ -148,11 +349,15 @@ def match_tail(
     reader: MapReader,
     config: Config,
     observer: Optional[DecoderObserver],
+    candidate_cache: Optional[CandidateCache] = None,
+    path_cache: Optional[PathCache] = None,
 ) -> List[Route]:
     """Searches for the rest of the line location.
 
     Every element of `candidates` is routed to every candidate for `tail[0]` (best scores first).
     Actually not _every_ element, just as many as it needs until some path matches the DNP.
+    From the candidate where this route ends, the search goes on for the rest of `tail`.
+    If the rest can not be matched, the search backtracks to the next matching route.
 
     Args:
         current:
@@ -169,48 +374,54 @@ def match_tail(
             The wanted behaviour, as configuration options
         observer:
             The optional decoder observer, which emits events and calls back.
+        candidate_cache:
+            The candidates already nominated for LRPs of the `tail`, so that backtracking
+            does not nominate candidates again.
+        path_cache:
+            The shortest paths already searched for.
 
     Returns:
-        If any candidate pair matches, the function calls itself for the rest of `tail` and
-        returns the resulting list of routes.
+        If the candidate pairs match for all of `tail`, the list of resulting routes.
 
     Raises:
         LRDecodeError:
-            If no candidate pair matches or a recursive call can not resolve a route.
+            If no candidate pair matches for some part of `tail`, even after backtracking.
     """
-    last_lrp = len(tail) == 1
-    # The accepted distance to next point. This helps to save computations and filter bad paths
-    minlen = (1 - config.max_dnp_deviation) * current.dnp - config.tolerated_dnp_dev
-    maxlen = (1 + config.max_dnp_deviation) * current.dnp + config.tolerated_dnp_dev
-    lfrc = config.tolerated_lfrc[current.lfrcnp]
-
-    # Generate all pairs of candidates for the first two lrps
-    next_lrp = tail[0]
-    next_candidates = list(nominate_candidates(next_lrp, reader, config, observer, last_lrp))
-
-    pairs = list(product(candidates, next_candidates))
-    # Sort by line scores
-    pairs.sort(key=lambda pair: (pair[0].score + pair[1].score), reverse=True)
-
-    # For every pair of candidates, search for a path matching our requirements
-    for (c_from, c_to) in pairs:
-        route = handleCandidatePair(
-            (current, next_lrp), (c_from, c_to), observer, lfrc, minlen, maxlen
+    if candidate_cache is None:
+        candidate_cache = {}
+    if path_cache is None:
+        path_cache = {}
+    last_index = len(tail) - 1
+
+    # The search state for every LRP pair, starting with (current, tail[0]). Each element iterates
+    # over the matching routes between its two LRPs. Its route is kept in `routes` while the search
+    # goes on with the next LRP pair. Backtracking means to go on with the next route of an element.
+    searches = [
+        matching_routes(
+            current, candidates, tail[0], last_index == 0, reader, config, observer, candidate_cache, path_cache
         )
-        if route is None:
+    ]
+    routes = []
+    while searches:
+        found = next(searches[-1], None)
+        if found is None:
+            searches.pop()
+            if routes:
+                debug("Resolving the remaining path had no success")
+                routes.pop()
             continue
-        if last_lrp:
-            return [route]
-        try:
-            return [route] + match_tail(
-                next_lrp, [c_to], tail[1:], reader, config, observer
+        route, c_to = found
+        routes.append(route)
+        index = len(searches)
+        if index > last_index:
+            return routes
+        searches.append(
+            matching_routes(
+                tail[index - 1], [c_to], tail[index], index == last_index,
+                reader, config, observer, candidate_cache, path_cache
             )
-        except LRDecodeError:
-            debug("Recursive call to resolve remaining path had no success")
-            continue
+        )
 
-    if observer is not None:
-        observer.on_matching_fail(current, next_lrp, candidates, next_candidates, "No candidate pair matches")
     raise LRDecodeError("Decoding was unsuccessful: No candidates left or available.")
 
 
@@ -221,6 +432,7 @@ def handleCandidatePair(
     lowest_frc: FRC,
     minlen: float,
     maxlen: float,
+    path_cache: Optional[PathCache] = None,
 ) -> Optional[Route]:
     """
     Try to find an adequate route between two LRP candidates.
@@ -238,6 +450,8 @@ def handleCandidatePair(
             The lowest acceptable route length in meters
         maxlen:
             The highest acceptable route length in meters
+        path_cache:
+            An optional cache of shortest paths, shared by all candidate pairs of a decoding
 
     Returns:
         If a route can not be found or has no acceptable length, None is returned.
@@ -245,15 +459,21 @@ def handleCandidatePair(
     """
     current, next_lrp = lrps
     source, dest = candidates
-    route = get_candidate_route(source, dest, lowest_frc, maxlen)
+    found = find_candidate_route(source, dest, lowest_frc, maxlen, path_cache)
 
-    if not route:
-        debug("No path for candidate found")
+    if not found:
+        # Tell a pair whose partial lines are too long apart from a pair without any path
+        if source.line.line_id != dest.line.line_id and \
+                source.distance_to_end() + dest.distance_from_start() > maxlen:
+            reason = "Candidate lines already exceed the maximum route length"
+        else:
+            reason = "No path for candidate found"
+        debug(reason)
         if observer is not None:
-            observer.on_route_fail(current, next_lrp, source, dest, "No path for candidate found")
+            observer.on_route_fail(current, next_lrp, source, dest, reason)
         return None
 
-    length = route.length()
+    route, length = found
 
     if observer is not None:
         observer.on_route_success(current, next_lrp, source, dest, route)
@@ -271,11 +491,21 @@ def handleCandidatePair(
     return route
 
 
-def is_valid_node(node: Node):
+def is_valid_node(node: Node, cache: Optional[NodeCache] = None):
     """
     Checks if a node is a valid node. A valid node is a node that corresponds to a real-world junction
+
+    Neighbouring candidate lines share their nodes. If a `cache` is given, the result
+    is looked up in and added to it, so that every node is checked only once.
     """
-    return not is_invalid_node(node)
+    if cache is None:
+        return not is_invalid_node(node)
+    node_id = node.node_id
+    valid = cache.get(node_id)
+    if valid is None:
+        valid = not is_invalid_node(node)
+        cache[node_id] = valid
+    return valid
 
 
 def is_invalid_node(node: Node):
@@ -283,24 +513,22 @@ def is_invalid_node(node: Node):
     Checks if a node is an invalid node. An invalid node is a node along a road and not at a real-world junction.
     """
 
-    # Get a list of all incoming lines to the node
-    incoming_lines = list(node.incoming_lines())
+    # Get a list of the incoming lines to the node. Only one or two of them can be along a road.
+    incoming_lines = list(islice(node.incoming_lines(), 3))
+    if len(incoming_lines) not in (1, 2):
+        return False
 
-    # Get a list of all outgoing lines from the node
-    outgoing_lines = list(node.outgoing_lines())
+    # Get a list of the outgoing lines from the node. One more than incoming is already too many.
+    outgoing_lines = list(islice(node.outgoing_lines(), len(incoming_lines) + 1))
 
     # Check the number of incoming and outgoing lines
-    if (len(incoming_lines) == 1 and len(outgoing_lines) == 1) or (len(incoming_lines) == 2 and len(outgoing_lines) == 2):
-        # Get the unique nodes of all incoming and outgoing lines
-        unique_nodes = set()
-
-        for line in incoming_lines:
-            unique_nodes.add(line.start_node)
-            unique_nodes.add(line.end_node)
-
-        for line in outgoing_lines:
-            unique_nodes.add(line.start_node)
-            unique_nodes.add(line.end_node)
+    if len(incoming_lines) == len(outgoing_lines):
+        # Get the unique nodes of all incoming and outgoing lines. Incoming lines end and
+        # outgoing lines start at this node, so only their other ends need to be looked up.
+        # Nodes are compared by id, as a map reader may create new node objects for each lookup.
+        unique_nodes = {node.node_id}
+        unique_nodes.update(line.start_node.node_id for line in incoming_lines)
+        unique_nodes.update(line.end_node.node_id for line in outgoing_lines)
 
         # If it is an invalid node, there should be 3 unique nodes
         return len(unique_nodes) == 3
@@ -74,6 +74,17 @@ class Config(NamedTuple):
     fow_standin_score: List[List[float]] = DEFAULT_FOW_STAND_IN_SCORE
     #: The bearing angle is computed along this distance on a given line. Given in meters.
     bear_dist: int = 20
+    #: A filter for candidate pairs with insufficient score.
+    #:
+    #: Candidate pairs are routed in the order of their score sum, highest first. Once this
+    #: sum is below this value, no more paths are searched between the two LRPs.
+    #: As it is the sum of two scores, it is in the range of [0.0, 2.0].
+    min_pair_score: float = 0.0
+    #: Limits the number of candidates considered per LRP.
+    #:
+    #: Only this many best-scored candidates of an LRP are paired with the candidates of its
+    #: neighbouring LRPs. `None` means that all candidates are considered.
+    max_candidates: Optional[int] = None
 
 
 DEFAULT_CONFIG = Config()
@@ -116,7 +127,9 @@ def load_config(source: Union[str, TextIOBase, dict]) -> Config:
             opened_source['geo_weight'],
             opened_source['bear_weight'],
             opened_source['fow_standin_score'],
-            opened_source['bear_dist']
+            opened_source['bear_dist'],
+            opened_source.get('min_pair_score', DEFAULT_CONFIG.min_pair_score),
+            opened_source.get('max_candidates', DEFAULT_CONFIG.max_candidates),
         ]
     )
 
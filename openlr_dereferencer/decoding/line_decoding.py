@@ -6,6 +6,7 @@ from ..maps import MapReader
 from ..observer import DecoderObserver
 from .candidate_functions import nominate_candidates, match_tail
 from .line_location import build_line_location, LineLocation
+from .path_math import coords
 from .routes import Route
 from .configuration import Config
 
@@ -17,10 +18,23 @@ def dereference_path(
         observer: Optional[DecoderObserver]
 ) -> List[Route]:
     "Decode the location reference path, without considering any offsets"
+    # Ask the map for the lines around all LRPs at once, which a reader may answer in one bulk query
+    nearby_lines = reader.find_lines_close_to_many([coords(lrp) for lrp in lrps], config.search_radius)
+    last_index = len(lrps) - 1
+    # Candidate lines of neighbouring LRPs share nodes, which need to be checked only once
+    node_cache = {}
+    candidate_cache = {
+        (lrp, index == last_index): list(
+            nominate_candidates(lrp, reader, config, observer, index == last_index, lines, node_cache)
+        )
+        for index, (lrp, lines) in enumerate(zip(lrps, nearby_lines))
+    }
     first_lrp = lrps[0]
-    first_candidates = list(nominate_candidates(first_lrp, reader, config, observer, False))
+    first_candidates = candidate_cache[(first_lrp, False)]
 
-    linelocationpath = match_tail(first_lrp, first_candidates, lrps[1:], reader, config, observer)
+    linelocationpath = match_tail(
+        first_lrp, first_candidates, lrps[1:], reader, config, observer, candidate_cache
+    )
     return linelocationpath
 
 
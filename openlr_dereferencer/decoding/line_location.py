@@ -73,6 +73,7 @@ def build_line_location(path: List[Route], reference: LineLocationReference) ->
     """Builds a LineLocation object from all location reference path parts and the offset values.
 
     The result will be a trimmed list of Line objects, with minimized offset values"""
-    p_off = reference.poffs * path[0].length()
-    n_off = reference.noffs * path[-1].length()
+    # Measuring a route takes a map lookup per line, so only do it for an offset to apply
+    p_off = reference.poffs * path[0].length() if reference.poffs else 0.0
+    n_off = reference.noffs * path[-1].length() if reference.noffs else 0.0
     return LineLocation(remove_offsets(combine_routes(path), p_off, n_off))
@@ -1,46 +1,51 @@
 "Functions for reckoning with paths, bearing, and offsets"
 
-from math import degrees
-from typing import List
-from logging import debug
+from math import degrees, hypot
+from typing import List, Optional, Tuple
+from logging import debug, getLogger, DEBUG
 from shapely.geometry import LineString, Point
-from shapely.ops import substring
 from openlr import Coordinates, LocationReferencePoint
 from .error import LRDecodeError
 from .routes import Route, PointOnLine
 from ..maps import Line
-from ..maps.wgs84 import interpolate, bearing, line_string_length
+from ..maps.wgs84 import bearing_along, distance, pairwise
 
 
 def remove_offsets(path: Route, p_off: float, n_off: float) -> Route:
     """Remove start+end offsets, measured in meters, from a route and return the result"""
     debug("Will consider positive offset = %.02fm and negative offset %.02fm.", p_off, n_off)
     lines = path.lines
-    debug("This route consists of %s and is %.02fm long.", lines, path.length())
+    # Computing the route length takes a map lookup per line, so only do it when it gets logged
+    if getLogger().isEnabledFor(DEBUG):
+        debug("This route consists of %s and is %.02fm long.", lines, path.length())
+    # The lines are trimmed by moving these indices, so that every line length is read only once
+    start_index = 0
+    end_index = len(lines) - 1
     # Remove positive offset
     debug("first line's offset is %.02f",path.absolute_start_offset)
     remaining_poff = p_off + path.absolute_start_offset
-    while remaining_poff >= lines[0].length:
+    start_length = lines[start_index].length
+    while remaining_poff >= start_length:
         debug("Remaining positive offset %.02f is greater than the first line. Removing it.", remaining_poff)
-        remaining_poff -= lines.pop(0).length
-        if not lines:
+        remaining_poff -= start_length
+        start_index += 1
+        if start_index > end_index:
             raise LRDecodeError("Offset is bigger than line location path")
+        start_length = lines[start_index].length
     # Remove negative offset
     remaining_noff = n_off + path.absolute_end_offset
-    while remaining_noff >= lines[-1].length:
+    end_length = start_length if end_index == start_index else lines[end_index].length
+    while remaining_noff >= end_length:
         debug("Remaining negative offset %.02f is greater than the last line. Removing it.", remaining_noff)
-        remaining_noff -= lines.pop().length
-        if not lines:
+        remaining_noff -= end_length
+        end_index -= 1
+        if end_index < start_index:
             raise LRDecodeError("Offset is bigger than line location path")
-    start_line = lines.pop(0)
-    if lines:
-        end_line = lines.pop()
-    else:
-        end_line = start_line
+        end_length = lines[end_index].length
     return Route(
-        PointOnLine.from_abs_offset(start_line, remaining_poff),
-        lines,
-        PointOnLine.from_abs_offset(end_line, end_line.length - remaining_noff)
+        PointOnLine.from_abs_offset(lines[start_index], remaining_poff),
+        lines[start_index + 1:end_index],
+        PointOnLine.from_abs_offset(lines[end_index], end_length - remaining_noff)
     )
 
 
@@ -53,31 +58,64 @@ def project(line: Line, coord: Coordinates) -> PointOnLine:
     """Computes the nearest point to `coord` on the line
 
     Returns: The point on `line` where this nearest point resides"""
-    fraction = line.geometry.project(Point(coord.lon, coord.lat), normalized=True)
-
-    to_projection_point = substring(line.geometry, 0.0, fraction, normalized=True)
-
-    meters_to_projection_point = line_string_length(to_projection_point)
-    geometry_length = line_string_length(line.geometry)
+    return project_onto_geometry(line, line.geometry, coord)[0]
+
+
+def project_onto_geometry(line: Line, geometry: LineString, coord: Coordinates) -> Tuple[PointOnLine, float]:
+    """Computes the nearest point to `coord` on the line like `project`, given its already fetched `geometry`
+
+    Returns: The point on `line` where this nearest point resides, and the geometry length in meters"""
+    # The projection point's distance from the line start, in the planar units of the geometry
+    remaining = geometry.project(Point(coord.lon, coord.lat))
+
+    # Measure the line and the part up to the projection point in one pass over the segments
+    meters_to_projection_point = None
+    geometry_length = 0.0
+    for (point_a, point_b) in pairwise(geometry.coords):
+        segment_a, segment_b = Coordinates(*point_a), Coordinates(*point_b)
+        if meters_to_projection_point is None:
+            planar_length = hypot(segment_b.lon - segment_a.lon, segment_b.lat - segment_a.lat)
+            if remaining <= planar_length:
+                fraction = remaining / planar_length if planar_length else 0.0
+                projection_point = Coordinates(
+                    segment_a.lon + fraction * (segment_b.lon - segment_a.lon),
+                    segment_a.lat + fraction * (segment_b.lat - segment_a.lat)
+                )
+                meters_to_projection_point = geometry_length + distance(segment_a, projection_point)
+            remaining -= planar_length
+        geometry_length += distance(segment_a, segment_b)
+    if meters_to_projection_point is None:
+        meters_to_projection_point = geometry_length
 
     length_fraction = meters_to_projection_point / geometry_length
 
-    return PointOnLine(line, length_fraction)
+    return PointOnLine(line, length_fraction), geometry_length
 
 
 def linestring_coords(line: LineString) -> List[Coordinates]:
     "Returns the edges of the line geometry as Coordinate list"
-    return [Coordinates(*point) for point in line.coords]
+    return list(map(Coordinates._make, line.coords))
+
+
+def split_point(parts: Tuple[Optional[LineString], Optional[LineString]]) -> Coordinates:
+    "Returns the point at which a line was split into `parts`, as returned by `PointOnLine.split`"
+    first, second = parts
+    if second is not None:
+        return Coordinates(*second.coords[0])
+    return Coordinates(*first.coords[-1])
 
 
 def compute_bearing(
         lrp: LocationReferencePoint,
         candidate: PointOnLine,
         is_last_lrp: bool,
-        bear_dist: float
+        bear_dist: float,
+        parts: Optional[Tuple[Optional[LineString], Optional[LineString]]] = None
 ) -> float:
-    "Returns the bearing angle of a partial line in degrees in the range 0.0 .. 360.0"
-    line1, line2 = candidate.split()
+    """Returns the bearing angle of a partial line in degrees in the range 0.0 .. 360.0
+
+    If the line of the candidate was already split at the candidate, pass the parts as `parts`."""
+    line1, line2 = candidate.split() if parts is None else parts
     if is_last_lrp:
         if line1 is None:
             return 0.0
@@ -87,6 +125,5 @@ def compute_bearing(
         if line2 is None:
             return 0.0
         coordinates = linestring_coords(line2)
-    bearing_point = interpolate(coordinates, bear_dist)
-    bear = bearing(coordinates[0], bearing_point)
+    bear = bearing_along(coordinates, bear_dist)
     return degrees(bear) % 360
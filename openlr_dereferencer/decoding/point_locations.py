@@ -8,12 +8,12 @@ from openlr import (
     SideOfRoad,
     PoiWithAccessPointLocationReference,
 )
-from ..maps import MapReader, path_length
+from ..maps import MapReader
 from ..maps.abstract import Line
 from ..observer import DecoderObserver
 from ..maps.wgs84 import interpolate
 from .line_decoding import dereference_path
-from .line_location import get_lines, Route, combine_routes
+from .line_location import Route, combine_routes
 from .configuration import Config
 from . import LRDecodeError
 
@@ -38,12 +38,15 @@ def point_along_linelocation(route: Route, length: float) -> Tuple[Line, float]:
 
     If the path is exhausted (`length` longer than `route`), raises an LRDecodeError."""
     leftover_length = length
-    leftover_length -= route.start.line.length * (1.0 - route.start.relative_offset)
+    # Every line length is a map lookup, so read each of them only once
+    start_line_length = route.start.line.length
+    leftover_length -= start_line_length * (1.0 - route.start.relative_offset)
     if leftover_length < 0.0:
-        return route.start.line, route.start.line.length * route.start.relative_offset + length
+        return route.start.line, start_line_length * route.start.relative_offset + length
     for road in route.path_inbetween:
-        if leftover_length > road.length:
-            leftover_length -= road.length
+        road_length = road.length
+        if leftover_length > road_length:
+            leftover_length -= road_length
         else:
             return road, leftover_length
     end_offset = route.end.line.length * route.end.relative_offset
@@ -87,7 +90,7 @@ def decode_poi_with_accesspoint(
 ) -> PoiWithAccessPoint:
     "Decodes a poi with access point location reference into a PoiWithAccessPoint"
     path = combine_routes(dereference_path(reference.points, reader, config, observer))
-    absolute_offset = path_length(get_lines([path])) * reference.poffs
+    absolute_offset = path.length() * reference.poffs
     line, line_offset = point_along_linelocation(path, absolute_offset)
     return PoiWithAccessPoint(
         line,
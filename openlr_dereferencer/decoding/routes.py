@@ -17,13 +17,16 @@ class PointOnLine(NamedTuple):
     #: A value of 0 references the starting point of the line.
     relative_offset: float
 
-    def _geometry_length_from_start(self):
-        geometry_length = line_string_length(self.line.geometry)
+    def _geometry_length_from_start(self, geometry: LineString) -> float:
+        geometry_length = line_string_length(geometry)
         return geometry_length * self.relative_offset
 
     def position(self) -> Coordinates:
         "Returns the actual geo position"
-        return interpolate(self.line.coordinates(), self._geometry_length_from_start())
+        # Fetch the line geometry from the map only once
+        geometry = self.line.geometry
+        coordinates = list(map(Coordinates._make, geometry.coords))
+        return interpolate(coordinates, self._geometry_length_from_start(geometry))
 
     def distance_from_start(self) -> float:
         "Returns the distance in meters from the start of the line to the point"
@@ -35,18 +38,20 @@ class PointOnLine(NamedTuple):
 
     def split(self) -> Tuple[Optional[LineString], Optional[LineString]]:
         "Splits the Line element that this point is along and returns the parts"
-        return split_line(self.line.geometry, self._geometry_length_from_start())
+        geometry = self.line.geometry
+        return split_line(geometry, self._geometry_length_from_start(geometry))
 
     @classmethod
     def from_abs_offset(cls, line: Line, meters_into: float):
         """Build a PointOnLine from an absolute offset value.
 
         Negative offsets are recognized and subtracted."""
+        line_length = line.length
         if meters_into >= 0.0:
-            return cls(line, meters_into / line.length)
+            return cls(line, meters_into / line_length)
         else:
-            negative_meters_into = line.length + meters_into
-            return cls(line, negative_meters_into / line.length)
+            negative_meters_into = line_length + meters_into
+            return cls(line, negative_meters_into / line_length)
 
 
 class Route(NamedTuple):
@@ -114,4 +119,4 @@ class Route(NamedTuple):
 
     def coordinates(self) -> List[Coordinates]:
         "Returns all Coordinates of this line location"
-        return [Coordinates(lon, lat) for (lon, lat) in self.shape.coords]
+        return list(map(Coordinates._make, self.shape.coords))
@@ -6,7 +6,8 @@ The result of the scoring functions will be floats from 0.0 to 1.0,
 with `1.0` being an exact match and 0.0 being a non-match."""
 
 from logging import debug
-from openlr import FRC, FOW, LocationReferencePoint
+from typing import Optional
+from openlr import Coordinates, FRC, FOW, LocationReferencePoint
 from ..maps.wgs84 import distance
 from .path_math import coords, PointOnLine, compute_bearing
 from .configuration import Config
@@ -17,12 +18,19 @@ def score_frc(wanted: FRC, actual: FRC) -> float:
     return 1.0 - abs(actual - wanted) / 7
 
 
-def score_geolocation(wanted: LocationReferencePoint, actual: PointOnLine, radius: float) -> float:
+def score_geolocation(
+        wanted: LocationReferencePoint, actual: PointOnLine, radius: float,
+        position: Optional[Coordinates] = None
+) -> float:
     """Scores the geolocation of a candidate.
 
-    A distance of `radius` or more will result in a 0.0 score."""
-    debug("Candidate coords are %s", actual.position())
-    dist = distance(coords(wanted), actual.position())
+    A distance of `radius` or more will result in a 0.0 score.
+
+    If the position of `actual` is already known, pass it as `position`."""
+    if position is None:
+        position = actual.position()
+    debug("Candidate coords are %s", position)
+    dist = distance(coords(wanted), position)
     if dist < radius:
         return 1.0 - dist / radius
     return 0.0
@@ -34,14 +42,13 @@ def angle_sector(angle: float) -> int:
 
     Args:
         angle:
-            the value is expected in degrees
+            the value is expected in degrees, from -360 to 720
     Returns:
         the sector to which the angle belongs to. Value in range [0,31]
     """
 
-    if angle < 0:
-        angle = angle + 360
-    return int(angle / (360 / 32)) % 32
+    # The modulo maps negative angles into [0, 360) as well
+    return int(angle % 360 / (360 / 32)) % 32
 
 
 def angle_sector_difference(angle1: float, angle2: float) -> int:
@@ -56,9 +63,7 @@ def angle_sector_difference(angle1: float, angle2: float) -> int:
     sector_diff = abs(angle_sector(angle1) - angle_sector(angle2))
     "Differences should be between 0 and 16. Direction (clockwise or counter clockwise) between the two sectors should "
     "not matter. Thus map a difference (sector_diff) larger than 16 needs to be mapped to 32-sector_diff"
-    if sector_diff > 16:
-        sector_diff = 32 - sector_diff
-    return sector_diff
+    return min(sector_diff, 32 - sector_diff)
 
 
 def score_angle_sector_differences(angle1: float, angle2: float) -> float:
@@ -113,17 +118,26 @@ def score_bearing(
 
 def score_lrp_candidate(
         wanted: LocationReferencePoint,
-        candidate: PointOnLine, config: Config, is_last_lrp: bool
+        candidate: PointOnLine, config: Config, is_last_lrp: bool,
+        bearing: Optional[float] = None, position: Optional[Coordinates] = None
 ) -> float:
     """Scores the candidate (line) for the LRP.
 
-    This is the average of fow, frc, geo and bearing score."""
+    This is the average of fow, frc, geo and bearing score.
+
+    If the bearing of the candidate was already computed (in degrees), pass it as `bearing`
+    to save computing it again. The same goes for its geo `position`."""
     debug("scoring %s with config %s", candidate, config)
-    geo_score = config.geo_weight * score_geolocation(wanted, candidate, config.search_radius)
+    geo_score = config.geo_weight * score_geolocation(wanted, candidate, config.search_radius, position)
     fow_score = config.fow_weight * config.fow_standin_score[wanted.fow][candidate.line.fow]
     frc_score = config.frc_weight * score_frc(wanted.frc, candidate.line.frc)
-    bear_score = score_bearing(wanted, candidate, is_last_lrp, config.bear_dist)
-    bear_score *= config.bear_weight
+    if config.bear_weight == 0.0:
+        # Skip computing the bearing when it does not count anyway
+        bear_score = 0.0
+    elif bearing is None:
+        bear_score = config.bear_weight * score_bearing(wanted, candidate, is_last_lrp, config.bear_dist)
+    else:
+        bear_score = config.bear_weight * score_angle_sector_differences(wanted.bear, bearing)
     score = fow_score + frc_score + geo_score + bear_score
     debug("Score: geo(%.02f) + fow(%.02f) + frc(%.02f) + bear(%.02f) = %.02f", geo_score, fow_score, frc_score, bear_score, score
     )
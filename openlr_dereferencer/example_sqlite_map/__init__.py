@@ -3,7 +3,7 @@ the interface in openlr_dereferencer.maps"""
 
 import os
 import sqlite3
-from typing import Sequence, Tuple, Iterable
+from typing import Sequence, Tuple, Iterable, List
 from openlr import Coordinates
 from .primitives import Line, Node, ExampleMapError, SRID
 from ..maps import MapReader, wgs84
@@ -72,3 +72,18 @@ class ExampleMapReader(MapReader):
         stmt = """SELECT rowid FROM lines WHERE PtDistWithin(MakePoint(?, ?), path, ?, 0)"""
         for (line_id,) in self.connection.execute(stmt, (lon, lat, dist)):
             yield Line(self, line_id)
+
+    def find_lines_close_to_many(self, coords: Sequence[Coordinates], dist: float) -> List[List[Line]]:
+        "Finds the lines within `dist` meters around each of `coords` with a single query"
+        if not coords:
+            return []
+        points = ", ".join(["(?, ?, ?)"] * len(coords))
+        stmt = f"""WITH points(idx, lon, lat) AS (VALUES {points})
+            SELECT points.idx, lines.rowid FROM points, lines
+            WHERE PtDistWithin(MakePoint(points.lon, points.lat), lines.path, ?, 0)
+            ORDER BY points.idx, lines.rowid"""
+        params = [value for (index, coord) in enumerate(coords) for value in (index, coord.lon, coord.lat)]
+        result = [[] for _ in coords]
+        for (index, line_id) in self.connection.execute(stmt, params + [dist]):
+            result[index].append(Line(self, line_id))
+        return result
@@ -5,6 +5,8 @@ SELECT AddGeometryColumn('nodes', 'coord', 4326, 'POINT', 2, 1);
 
 CREATE TABLE lines (startnode INT, endnode INT, frc INT, fow INT);
 SELECT AddGeometryColumn('lines', 'path', 4326, 'LINESTRING', 2, 1);
+CREATE INDEX lines_startnode ON lines (startnode);
+CREATE INDEX lines_endnode ON lines (endnode);
 
 INSERT INTO nodes (coord) VALUES
     (MakePoint(13.41, 52.523, 4326)),
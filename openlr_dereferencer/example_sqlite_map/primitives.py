@@ -3,6 +3,7 @@
 from itertools import chain
 from typing import Iterable
 from openlr import Coordinates, FRC, FOW
+from shapely import wkb
 from shapely.geometry import LineString
 from ..maps import Line as AbstractLine, Node as AbstractNode
 
@@ -13,6 +14,8 @@ SRID = 4326
 class Line(AbstractLine):
     "Line object implementation for the example format"
 
+    __slots__ = ("map_reader", "line_id_internal")
+
     def __init__(self, map_reader, line_id: int):
         if not isinstance(line_id, int):
             raise ExampleMapError(f"Line id '{line_id}' has confusing type {type(line_id)}")
@@ -58,8 +61,10 @@ class Line(AbstractLine):
     @property
     def geometry(self) -> LineString:
         "Returns the line geometry"
-        points = [self.point_n(index + 1) for index in range(self.num_points())]
-        return LineString(points)
+        # Read the whole path at once instead of querying its points one by one
+        stmt = "SELECT AsBinary(path) FROM lines WHERE rowid = ?"
+        (path,) = self.map_reader.connection.execute(stmt, (self.line_id,)).fetchone()
+        return wkb.loads(bytes(path))
 
     def distance_to(self, coord) -> float:
         "Returns the distance of this line to `coord` in meters"
@@ -107,6 +112,8 @@ class Line(AbstractLine):
 class Node(AbstractNode):
     "Node class implementation for example_sqlite_map"
 
+    __slots__ = ("map_reader", "node_id_internal")
+
     def __init__(self, map_reader, node_id: int):
         if not isinstance(node_id, int):
             raise ExampleMapError(f"Node id '{id}' has confusing type {type(node_id)}")
@@ -4,4 +4,4 @@ through which the decoder accesses the map.
 """
 
 from .abstract import MapReader, Line, Node, path_length
-from .a_star import shortest_path
+from .a_star import shortest_path, shortest_path_with_length
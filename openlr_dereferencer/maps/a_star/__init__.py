@@ -1,30 +1,27 @@
 """
 Provides the shortest_path(map, start, end) -> List[Line] function, which
-finds a shortest path between two nodes.
+finds a shortest path between two nodes. shortest_path_with_length also returns its length.
 """
-from typing import List, Optional, Callable, NamedTuple
-from heapq import heapify, heappush, heappop
-from functools import total_ordering
+from typing import List, Optional, Callable, NamedTuple, Tuple
+from heapq import heappush, heappop
+from itertools import count
 from ..abstract import Node, Line
-from .tools import heuristic, LRPathNotFoundError, tautology
+from ..wgs84 import distance
+from .tools import LRPathNotFoundError, tautology
 
 
-class Score(NamedTuple):
-    """The score of a single item in the search priority queue"""
+class PQItem(NamedTuple):
+    """A single item in the search priority queue
+
+    Items are ordered by their plain tuple comparison. The unique `tiebreaker` makes sure that
+    two items never need to compare their nodes."""
     f: float
     g: float
-
-@total_ordering
-class PQItem(NamedTuple):
-    """A single item in the search priority queue"""
-    score: Score
+    tiebreaker: int
     node: Node
     line: Line
     previous: "PQItem"
 
-    def __lt__(self, other):
-        return self.score < other.score
-
 
 def shortest_path(
         start: Node,
@@ -68,17 +65,41 @@ def shortest_path(
             * No path exists were all lines pass the `linefilter`
             * All existing paths are longer than `maxlen`
     """
+    return shortest_path_with_length(start, end, linefilter, maxlen)[0]
+
+
+def shortest_path_with_length(
+        start: Node,
+        end: Node,
+        linefilter: Callable[[Line], bool] = tautology,
+        maxlen: float = float("inf"),
+) -> Tuple[List[Line], float]:
+    """
+    Returns a shortest path like `shortest_path`, along with its length in meters.
+
+    The search adds up the path length anyway, so the lines do not need to be measured again.
+    """
+
+    # Breaks ties between queue items with equal scores
+    tiebreaker = count()
+
+    # The heuristic is the geographical distance to the end node. Look up its coordinates
+    # only once, and remember the estimate for every node, as a node may be reached repeatedly.
+    end_coordinates = end.coordinates
+    estimates = {}
 
     # The initial queue item
-    initial = PQItem(Score(heuristic(start, end), 0), start, None, None)
+    initial = PQItem(distance(start.coordinates, end_coordinates), 0, next(tiebreaker), start, None, None)
 
-    # The queue
+    # The queue. A list with a single item already is a heap.
     open_set = [initial]
-    heapify(open_set)
 
     # The seen items
     closed_set = set()
 
+    # The shortest known distance from the start for every queued node
+    best_g_scores = {start.node_id: 0.0}
+
     # Keep trying while the queue is not empty
     while open_set:
         # Pop the next item from the queue
@@ -87,15 +108,16 @@ def shortest_path(
 
         # Check if the goal node has been reached
         if current_node.node_id == end.node_id:
-            # Build the result path
+            # Build the result path, collecting the lines backwards from the goal
             lines = []
             c = current
 
             while c.previous:
-                lines.insert(0, c.line)
+                lines.append(c.line)
                 c = c.previous
 
-            return lines
+            lines.reverse()
+            return lines, current.g
 
         # Check if the item has been seen already
         if current_node.node_id in closed_set:
@@ -107,18 +129,32 @@ def shortest_path(
                 continue
 
             neighbor_node = line.end_node
+            neighbor_id = neighbor_node.node_id
+
+            if neighbor_id in closed_set:
+                continue
 
-            if neighbor_node.node_id in closed_set:
+            # A node already queued with an equal or shorter distance can not be improved
+            neighbor_g_score = current.g + line.length
+            if neighbor_g_score >= best_g_scores.get(neighbor_id, float("inf")):
                 continue
 
-            neighbor_g_score = current.score.g + line.length
-            neighbor_f_score = neighbor_g_score + heuristic(neighbor_node, end)
+            estimate = estimates.get(neighbor_id)
+            if estimate is None:
+                estimate = distance(neighbor_node.coordinates, end_coordinates)
+                estimates[neighbor_id] = estimate
+
+            neighbor_f_score = neighbor_g_score + estimate
 
             if neighbor_f_score > maxlen:
                 continue
 
+            best_g_scores[neighbor_id] = neighbor_g_score
+
             neighbor = PQItem(
-                Score(neighbor_f_score, neighbor_g_score),
+                neighbor_f_score,
+                neighbor_g_score,
+                next(tiebreaker),
                 neighbor_node,
                 line,
                 current
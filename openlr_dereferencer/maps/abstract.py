@@ -45,13 +45,17 @@ they can be used to implement line IDs.
 
 
 from abc import ABC, abstractmethod
-from typing import Iterable, Hashable, Sequence
+from typing import Iterable, Hashable, List, Sequence
 from openlr import Coordinates, FOW, FRC
 from shapely.geometry import LineString, Point
 from shapely.geometry.base import BaseGeometry
 
 
 class GeometricObject(ABC):
+    # Map readers create lots of line and node objects. The empty slots allow
+    # implementations to define their own `__slots__` and skip the per-instance dict.
+    __slots__ = ()
+
     @property
     @abstractmethod
     def geometry(self) -> BaseGeometry:
@@ -60,6 +64,8 @@ class GeometricObject(ABC):
 class Line(GeometricObject):
     "Abstract Line class, modelling a line coming from a map reader"
 
+    __slots__ = ()
+
     @property
     @abstractmethod
     def line_id(self) -> Hashable:
@@ -94,7 +100,7 @@ class Line(GeometricObject):
 
     def coordinates(self) -> Sequence[Coordinates]:
         """Returns the shape of the line as list of Coordinates"""
-        return [Coordinates(*point) for point in self.geometry.coords]
+        return list(map(Coordinates._make, self.geometry.coords))
 
     @property
     def length(self) -> float:
@@ -108,6 +114,8 @@ class Line(GeometricObject):
 class Node(GeometricObject):
     "Abstract class modelling a node returned by a map reader"
 
+    __slots__ = ()
+
     @property
     @abstractmethod
     def coordinates(self) -> Coordinates:
@@ -175,7 +183,21 @@ class MapReader(ABC):
     def find_lines_close_to(self, coord: Coordinates, dist: float) -> Iterable[Line]:
         """Iterates over all lines within `dist` meters around `coord`.
 
-        No order specified here."""
+        No order specified here.
+
+        The decoder calls this once for every LRP to find candidate lines. On big maps,
+        implementations should answer it from a spatial index (e.g. an R-tree over
+        the line bounding boxes) instead of scanning all lines."""
+
+    def find_lines_close_to_many(
+        self, coords: Sequence[Coordinates], dist: float
+    ) -> List[List[Line]]:
+        """Returns, for every coordinate in `coords`, the lines within `dist` meters around it.
+
+        The decoder uses this to look up the candidate lines of all LRPs of a location reference
+        at once. This default implementation calls `find_lines_close_to` for every coordinate.
+        Readers that can answer several queries in one bulk request should override it."""
+        return [list(self.find_lines_close_to(coord, dist)) for coord in coords]
 
 
 def path_length(lines: Iterable[Line]) -> float:
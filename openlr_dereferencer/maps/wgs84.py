@@ -2,6 +2,7 @@
 from math import radians, degrees
 from typing import Sequence, Tuple, Optional
 from geographiclib.geodesic import Geodesic
+from geographiclib.geodesicline import GeodesicLine
 from openlr import Coordinates
 from shapely.geometry import LineString
 from itertools import tee
@@ -59,21 +60,53 @@ def extrapolate(point: Coordinates, dist: float, angle: float) -> Coordinates:
     return Coordinates(line["lon2"], line["lat2"])
 
 
+def _segment(point_a: Coordinates, point_b: Coordinates) -> GeodesicLine:
+    """Returns the geodesic from `point_a` to `point_b`
+
+    Its length in meters is stored in the attribute `s13`, and `walk` finds points on it."""
+    return Geodesic.WGS84.InverseLine(
+        point_a.lat, point_a.lon, point_b.lat, point_b.lon,
+        Geodesic.DISTANCE_IN | Geodesic.LATITUDE | Geodesic.LONGITUDE
+    )
+
+
+def _walk(segment: GeodesicLine, dist: float) -> Coordinates:
+    "Returns the point `dist` meters along the geodesic `segment`"
+    position = segment.Position(dist, Geodesic.LATITUDE | Geodesic.LONGITUDE)
+    return Coordinates(position["lon2"], position["lat2"])
+
+
 def interpolate(path: Sequence[Coordinates], distance_meters: float) -> Coordinates:
     """Go `distance` meters along the `path` and return the resulting point
 
     When the length of the path is too short, returns its last coordinate"""
     remaining_distance = distance_meters
-    segments = [(path[i], path[i + 1]) for i in range(len(path) - 1)]
-    for (point1, point2) in segments:
-        segment_length = distance(point1, point2)
+    for (point1, point2) in pairwise(path):
         if remaining_distance == 0.0:
             return point1
-        if remaining_distance < segment_length:
-            angle = bearing(point1, point2)
-            return extrapolate(point1, remaining_distance, angle)
-        remaining_distance -= segment_length
-    return segments[-1][1]
+        # One inverse problem per segment yields both its length and the line to walk on
+        segment = _segment(point1, point2)
+        if remaining_distance < segment.s13:
+            return _walk(segment, remaining_distance)
+        remaining_distance -= segment.s13
+    return path[-1]
+
+
+def bearing_along(path: Sequence[Coordinates], distance_meters: float) -> float:
+    """Returns the bearing from the start of `path` to the point `distance_meters` along it
+
+    Like `bearing`, the result is in radians between -pi and pi."""
+    if distance_meters > 0.0 and len(path) > 1:
+        segment = Geodesic.WGS84.InverseLine(
+            path[0].lat, path[0].lon, path[1].lat, path[1].lon, Geodesic.DISTANCE_IN | Geodesic.AZIMUTH
+        )
+        # A point on the first segment lies on the geodesic to its end, in the direction of its azimuth
+        if distance_meters < segment.s13:
+            return radians(segment.azi1)
+        # Otherwise, the point lies beyond the first segment, whose length is already known
+        return bearing(path[0], interpolate(path[1:], distance_meters - segment.s13))
+    return bearing(path[0], interpolate(path, distance_meters))
+
 
 def split_line(line: LineString, meters_into: float) -> Tuple[Optional[LineString], Optional[LineString]]:
     "Splits a line at `meters_into` meters and returns the two parts. A part is None if it would be a Point"
@@ -84,14 +117,14 @@ def split_line(line: LineString, meters_into: float) -> Tuple[Optional[LineStrin
     for (point_from, point_to) in pairwise(line.coords):
         if splitpoint is None:
             first_part.append(point_from)
-            (coord_from, coord_to) = (Coordinates(*point_from), Coordinates(*point_to))
-            segment_length = distance(coord_from, coord_to)
-            if remaining_offset < segment_length:
-                splitpoint = interpolate([coord_from, coord_to], remaining_offset)
+            coord_from = Coordinates(*point_from)
+            segment = _segment(coord_from, Coordinates(*point_to))
+            if remaining_offset < segment.s13:
+                splitpoint = coord_from if remaining_offset == 0.0 else _walk(segment, remaining_offset)
                 if splitpoint != coord_from:
                     first_part.append(splitpoint)
                 second_part = [splitpoint, point_to]
-            remaining_offset -= segment_length
+            remaining_offset -= segment.s13
         else:
             second_part.append(point_to)
     if splitpoint is None:
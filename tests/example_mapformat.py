@@ -11,6 +11,8 @@ SELECT AddGeometryColumn('nodes', 'coord', {SRID}, 'POINT', 2, 1);
 
 CREATE TABLE lines (startnode INT, endnode INT, frc INT, fow INT);
 SELECT AddGeometryColumn('lines', 'path', {SRID}, 'LINESTRING', 2, 1);
+CREATE INDEX lines_startnode ON lines (startnode);
+CREATE INDEX lines_endnode ON lines (endnode);
 
 INSERT INTO nodes (id, coord) VALUES
     (0, MakePoint(13.41, 52.525, {SRID})),
@@ -2,7 +2,7 @@
 
 import unittest
 
-from openlr_dereferencer.maps import shortest_path
+from openlr_dereferencer.maps import shortest_path, shortest_path_with_length, path_length
 from openlr_dereferencer.example_sqlite_map import ExampleMapReader
 
 from .example_mapformat import setup_testdb_in_memory, remove_db_file
@@ -54,5 +54,13 @@ class AStarTests(unittest.TestCase):
         path = [line.line_id for line in path]
         self.assertSequenceEqual(path, [8, 9, 10])
 
+    def test_shortest_path_with_length(self):
+        "The path length counted by the search equals the summed line lengths"
+        point_a = self.reader.get_node(1)
+        point_b = self.reader.get_node(11)
+        path, length = shortest_path_with_length(point_a, point_b)
+        self.assertSequenceEqual([line.line_id for line in path], [2, 5, 8, 14])
+        self.assertAlmostEqual(length, path_length(path))
+
     def tearDown(self):
         self.reader.connection.close()
@@ -11,14 +11,16 @@ from openlr import Coordinates, FRC, FOW, LineLocationReference, LocationReferen
 
 from openlr_dereferencer import decode, Config
 from openlr_dereferencer.decoding import PointAlongLine, LineLocation, LRDecodeError, PoiWithAccessPoint
-from openlr_dereferencer.decoding.candidate_functions import nominate_candidates, make_candidate
+from openlr_dereferencer.decoding.candidate_functions import nominate_candidates, make_candidate, \
+    ordered_pairs, cached_shortest_path, is_valid_node, is_invalid_node, handleCandidatePair
+from openlr_dereferencer.decoding.candidate import Candidate
 from openlr_dereferencer.decoding.scoring import score_geolocation, score_frc, \
-    score_bearing, score_angle_difference
+    score_bearing, score_angle_difference, angle_sector
 from openlr_dereferencer.decoding.routes import PointOnLine, Route
 from openlr_dereferencer.decoding.path_math import remove_offsets
 from openlr_dereferencer.observer import SimpleObserver
 from openlr_dereferencer.example_sqlite_map import ExampleMapReader
-from openlr_dereferencer.maps.wgs84 import distance, bearing, extrapolate
+from openlr_dereferencer.maps.wgs84 import distance, bearing, extrapolate, interpolate, bearing_along
 
 from .example_mapformat import setup_testdb, setup_testdb_in_memory, remove_db_file
 
@@ -273,6 +275,13 @@ class DecodingTests(unittest.TestCase):
         score = score_bearing(wanted, PointOnLine(line, 1.0), True, self.config.bear_dist)
         self.assertAlmostEqual(score, 0.0)
 
+    def test_bearing_along(self):
+        "The bearing along a path equals the bearing to the interpolated point, within the first segment or not"
+        path = [Coordinates(13.41, 52.525), Coordinates(13.414, 52.525), Coordinates(13.4145, 52.529)]
+        for dist in [0.0, 20.0, 300.0, 1000.0]:
+            expected = bearing(path[0], interpolate(path, dist))
+            self.assertAlmostEqual(bearing_along(path, dist), expected)
+
     def test_anglescore_1(self):
         "Test the angle scoring function from 0"
         sub_testcases = [-360, -720, 0, 180, 540, 720]
@@ -285,6 +294,12 @@ class DecodingTests(unittest.TestCase):
         scores = map(lambda arc: score_angle_difference(271, arc), sub_testcases)
         self.assertIterableAlmostEqual([1.0, 0.0, 0.5, 0.75], list(scores), 0.001)
 
+    def test_angle_sector(self):
+        "Angles from -360 to 720 degrees are mapped to the sector of their direction"
+        angles = [-360.0, -359.0, -90.0, -0.5, 0.0, 11.0, 11.25, 90.0, 359.9, 360.0, 450.0, 719.9]
+        sectors = [angle_sector(angle) for angle in angles]
+        self.assertListEqual(sectors, [0, 0, 24, 31, 0, 0, 1, 8, 31, 0, 8, 31])
+
     def test_generate_candidates_1(self):
         "Generate candidates and pick the best"
         reference = get_test_linelocation_1()
@@ -309,6 +324,15 @@ class DecodingTests(unittest.TestCase):
             self.assertAlmostEqual(a.lon, b.lon, delta=0.00001)
             self.assertAlmostEqual(a.lat, b.lat, delta=0.00001)
 
+    def test_decode_without_bearing(self):
+        "Decode a line location of 3 LRPs while ignoring the bearing"
+        reference = get_test_linelocation_1()
+        myconfig = Config(
+            max_bear_deviation=180.0, bear_weight=0.0, fow_weight=1 / 3, frc_weight=1 / 3, geo_weight=1 / 3
+        )
+        location = decode(reference, self.reader, config=myconfig)
+        self.assertListEqual([1, 3, 4], [l.line_id for l in location.lines])
+
     def test_decode_nopath(self):
         "Decode a line location where no short-enough path exists"
         reference = get_test_linelocation_2()
@@ -358,6 +382,16 @@ class DecodingTests(unittest.TestCase):
         self.assertAlmostEqual(coords.lat, 52.5270, delta=0.0001)
         self.assertEqual(poi.poi, Coordinates(13.414, 52.526))
 
+    def test_decode_poi_near_road_node(self):
+        "The access point offset is measured along the route, which may start within a line"
+        # Near node 3, which only connects lines 3 and 4, so the route is not snapped to it
+        lrp1 = LocationReferencePoint(13.41445, 52.5286, FRC.FRC2, FOW.SINGLE_CARRIAGEWAY, 170.0, FRC.FRC2, 456.6)
+        lrp2 = get_test_linelocation_1().points[-1]
+        reference = get_test_poi()._replace(points=[lrp1, lrp2])
+        poi: PoiWithAccessPoint = decode(reference, self.reader)
+        self.assertEqual(poi.line.line_id, 4)
+        self.assertAlmostEqual(poi.positive_offset, 247.4, delta=0.1)
+
     def test_decode_invalid_poi(self):
         "Test if decoding an invalid POI with access point location raises an error"
         reference = get_test_poi()
@@ -446,6 +480,78 @@ class DecodingTests(unittest.TestCase):
         self.assertListEqual([20], lines)
         self.assertGreater(len(observer.failed_matches), 0)
 
+    def test_backtracking_nominates_once(self):
+        "Backtracking reuses the candidates which were already nominated for an LRP"
+        myconfig = Config(search_radius=5, max_dnp_deviation=0.02)
+        reference = get_test_linelocation_4()
+        observer = SimpleObserver()
+        decode(reference, self.reader, observer=observer, config=myconfig)
+        for candidates in observer.candidates.values():
+            line_ids = [candidate.line.line_id for candidate in candidates]
+            self.assertEqual(len(line_ids), len(set(line_ids)))
+
+    def test_cached_shortest_path(self):
+        "A cached path search is reused, also for a different maximum length"
+        start, dest = self.reader.get_node(1), self.reader.get_node(11)
+        cache = {}
+        path, length = cached_shortest_path(start, dest, FRC.FRC7, float("inf"), cache)
+        self.assertListEqual([line.line_id for line in path], [2, 5, 8, 14])
+        self.assertAlmostEqual(length, sum(line.length for line in path))
+        self.assertEqual(len(cache), 1)
+        self.assertIs(cached_shortest_path(start, dest, FRC.FRC7, 10000.0, cache)[0], path)
+        self.assertIsNone(cached_shortest_path(start, dest, FRC.FRC7, 1.0, cache))
+        self.assertEqual(len(cache), 1)
+
+    def test_route_fail_partial_lines_too_long(self):
+        "A pair whose partial lines exceed the maximum length is reported apart from a missing path"
+        lrps = tuple(get_test_linelocation_1().points[:2])
+        source = Candidate(self.reader.get_line(1), 0.0)
+        dest = Candidate(self.reader.get_line(4), 0.5)
+        observer = SimpleObserver()
+        self.assertIsNone(handleCandidatePair(lrps, (source, dest), observer, FRC.FRC7, 0.0, 10.0))
+        self.assertEqual(
+            observer.attempted_routes[-1].reason, "Candidate lines already exceed the maximum route length"
+        )
+
+    def test_min_pair_score(self):
+        "No path is searched for candidate pairs below the minimum pair score"
+        reference = get_test_linelocation_1()
+        observer = SimpleObserver()
+        with self.assertRaises(LRDecodeError):
+            decode(reference, self.reader, observer=observer, config=Config(min_pair_score=2.0))
+        self.assertListEqual(observer.attempted_routes, [])
+
+    def test_max_candidates(self):
+        "Only the best-scored candidates are nominated if their number is limited"
+        lrp = get_test_linelocation_1().points[0]
+        candidates = list(nominate_candidates(lrp, self.reader, self.config, None, False))
+        best = max(candidates, key=lambda candidate: candidate.score)
+        limited = list(nominate_candidates(lrp, self.reader, self.config._replace(max_candidates=1), None, False))
+        self.assertListEqual([c.line.line_id for c in limited], [best.line.line_id])
+
+    def test_is_invalid_node(self):
+        "A node which only connects two lines of a road is invalid, a junction is not"
+        self.assertTrue(is_invalid_node(self.reader.get_node(3)))
+        self.assertFalse(is_invalid_node(self.reader.get_node(4)))
+
+    def test_is_valid_node_cache(self):
+        "The validity of a node is remembered by its id"
+        node = self.reader.get_node(2)
+        cache = {}
+        valid = is_valid_node(node, cache)
+        self.assertDictEqual(cache, {2: valid})
+        self.assertEqual(is_valid_node(self.reader.get_node(2), cache), valid)
+        self.assertEqual(len(cache), 1)
+
+    def test_find_lines_close_to_many(self):
+        "The bulk line query answers every coordinate like a single query would"
+        points = [Coordinates(13.41, 52.525), Coordinates(13.414, 52.525)]
+        for point, lines in zip(points, self.reader.find_lines_close_to_many(points, 20)):
+            self.assertListEqual(
+                [line.line_id for line in lines],
+                [line.line_id for line in self.reader.find_lines_close_to(point, 20)]
+            )
+
     def tearDown(self):
         self.reader.connection.close()
 
@@ -460,6 +566,13 @@ class DecodingToolsTests(unittest.TestCase):
         self.assertDictEqual(config.tolerated_lfrc, DEFAULT_CONFIG.tolerated_lfrc)
         self.assertEqual(config.bear_dist, DEFAULT_CONFIG.bear_dist)
 
+    def test_load_config_without_new_options(self):
+        "Options missing in a saved config take their default values"
+        saved = save_config(DEFAULT_CONFIG)
+        del saved["min_pair_score"]
+        config = load_config(saved)
+        self.assertEqual(config.min_pair_score, DEFAULT_CONFIG.min_pair_score)
+
     def test_remove_offsets(self):
         "Remove offsets containing lines"
         node0 = DummyNode(Coordinates(13.128987, 52.494595))
@@ -476,6 +589,26 @@ class DecodingToolsTests(unittest.TestCase):
         self.assertListEqual(route.lines, [lines[1]])
         self.assertAlmostEqual(route.length(), 30, delta=1)
 
+    def test_ordered_pairs(self):
+        "Candidate pairs are yielded by descending score sum"
+        candidates = []
+        for score in [0.5, 0.9, 0.3, 0.7]:
+            candidate = Candidate(None, 0.0)
+            candidate.score = score
+            candidates.append(candidate)
+        next_candidates = candidates[:3]
+        pairs = list(ordered_pairs(candidates, next_candidates))
+        self.assertEqual(len(pairs), len(candidates) * len(next_candidates))
+        self.assertEqual(len({(id(a), id(b)) for (a, b) in pairs}), len(pairs))
+        sums = [a.score + b.score for (a, b) in pairs]
+        self.assertListEqual(sums, sorted(sums, reverse=True))
+        self.assertListEqual(list(ordered_pairs(candidates, [])), [])
+        # Few pairs are ordered the same way
+        small_pairs = list(ordered_pairs(candidates[:2], next_candidates))
+        self.assertEqual(len(small_pairs), 2 * len(next_candidates))
+        small_sums = [a.score + b.score for (a, b) in small_pairs]
+        self.assertListEqual(small_sums, sorted(small_sums, reverse=True))
+
     def test_remove_offsets_raises(self):
         "Remove too big offsets"
         node0 = DummyNode(Coordinates(13.128987, 52.494595))